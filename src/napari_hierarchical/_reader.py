@@ -2,6 +2,9 @@ from napari.viewer import current_viewer
 
 from ._controller import controller
 
+# napari's sentinel for "file read, but no layers to add"
+_EMPTY_LAYER_DATA = [(None,)]
+
 
 def napari_get_reader(path):
     if isinstance(path, list):
@@ -21,4 +24,4 @@ def _reader_function(path):
         controller.register_viewer(viewer)
     viewer.window.add_plugin_dock_widget("napari-hierarchical", widget_name="Groups")
     viewer.window.add_plugin_dock_widget("napari-hierarchical", widget_name="Arrays")
-    return [(None,)]
+    return _EMPTY_LAYER_DATA
@@ -0,0 +1,257 @@
+import numpy as np
+import pytest
+from napari.layers import Image
+
+from napari_hierarchical.model import Array, Group
+
+
+def _make_layer(name: str = "layer", visible: bool = True) -> Image:
+    return Image(np.zeros((2, 2)), name=name, visible=visible)
+
+
+def _assert_counts(group: Group) -> None:
+    for g in [group, *group.iter_children(recursive=True)]:
+        arrays = list(g.iter_arrays(recursive=True))
+        loaded = [array for array in arrays if array.loaded]
+        visible = [array for array in loaded if array.visible]
+        assert g._n_arrays == len(arrays)
+        assert g._n_loaded == len(loaded)
+        assert g._n_visible == len(visible)
+        expected_loaded = (
+            False if not loaded else True if len(loaded) == len(arrays) else None
+        )
+        expected_visible = (
+            False if not visible else True if len(visible) == len(loaded) else None
+        )
+        assert g.loaded is expected_loaded
+        assert g.visible is expected_visible
+
+
+def _make_tree():
+    root = Group(name="root")
+    child = Group(name="child")
+    grandchild = Group(name="grandchild")
+    root.children.append(child)
+    child.children.append(grandchild)
+    arrays = [Array(name=f"a{i}") for i in range(4)]
+    root.arrays.append(arrays[0])
+    child.arrays.append(arrays[1])
+    grandchild.arrays.extend(arrays[2:])
+    return root, child, grandchild, arrays
+
+
+def test_counts_on_load_and_unload():
+    root, child, grandchild, arrays = _make_tree()
+    _assert_counts(root)
+    arrays[2].layer = _make_layer("a2")
+    _assert_counts(root)
+    arrays[3].layer = _make_layer("a3", visible=False)
+    _assert_counts(root)
+    arrays[3].layer.visible = True
+    _assert_counts(root)
+    arrays[2].layer = None
+    _assert_counts(root)
+    arrays[3].layer = _make_layer("a3 replaced", visible=False)
+    _assert_counts(root)
+
+
+def test_counts_on_show_and_hide():
+    root, child, grandchild, arrays = _make_tree()
+    for array in arrays[1:]:
+        array.layer = _make_layer(array.name, visible=False)
+    root.show()
+    _assert_counts(root)
+    child.hide()
+    _assert_counts(root)
+    grandchild.show()
+    _assert_counts(root)
+
+
+def test_counts_on_insert_remove_and_replace():
+    root, child, grandchild, arrays = _make_tree()
+    arrays[1].layer = _make_layer("a1")
+    loaded_array = Array(name="loaded", layer=_make_layer("loaded", visible=False))
+    grandchild.arrays.insert(0, loaded_array)
+    _assert_counts(root)
+    grandchild.arrays.remove(arrays[2])
+    _assert_counts(root)
+    child.arrays[0] = Array(name="replacement")
+    _assert_counts(root)
+    new_child = Group(name="new child")
+    new_child.arrays.append(Array(name="new", layer=_make_layer("new")))
+    root.children.append(new_child)
+    _assert_counts(root)
+    root.children[0] = Group(name="empty")
+    _assert_counts(root)
+    del root.children[0]
+    _assert_counts(root)
+
+
+def test_counts_on_subtree_move():
+    root, child, grandchild, arrays = _make_tree()
+    arrays[2].layer = _make_layer("a2")
+    other = Group(name="other")
+    root.children.append(other)
+    child.children.remove(grandchild)
+    _assert_counts(root)
+    _assert_counts(grandchild)
+    other.children.append(grandchild)
+    _assert_counts(root)
+    root.children.move(1, 0)
+    _assert_counts(root)
+    arrays[3].layer = _make_layer("a3")
+    _assert_counts(root)
+
+
+def test_from_group_copies_structure_and_counts():
+    root, child, grandchild, arrays = _make_tree()
+    arrays[1].layer = _make_layer("a1")
+    arrays[1].flat_grouping_groups["Path"] = "/child/a1"
+    new_root = Group.from_group(root)
+    _assert_counts(new_root)
+    assert [group.name for group in new_root.iter_children(recursive=True)] == [
+        "child",
+        "grandchild",
+    ]
+    assert [array.name for array in new_root.iter_arrays(recursive=True)] == [
+        array.name for array in root.iter_arrays(recursive=True)
+    ]
+    new_child = new_root.children["child"]
+    assert new_child.parent is new_root
+    assert new_child.arrays["a1"].parent is new_child
+    assert new_child.arrays["a1"].flat_grouping_groups["Path"] == "/child/a1"
+    new_child.children["grandchild"].arrays["a2"].layer = _make_layer("a2")
+    _assert_counts(new_root)
+    _assert_counts(root)
+
+
+def test_group_events_per_state_change():
+    root, child, grandchild, arrays = _make_tree()
+    events = []
+    for group in (root, child, grandchild):
+        group.events.loaded.connect(
+            lambda event: events.append(("loaded", event.source.name))
+        )
+        group.events.visible.connect(
+            lambda event: events.append(("visible", event.source.name))
+        )
+    layer = _make_layer("a2")
+    arrays[2].layer = layer
+    assert sorted(events) == sorted(
+        (kind, name)
+        for kind in ("loaded", "visible")
+        for name in ("root", "child", "grandchild")
+    )
+    events.clear()
+    layer.visible = False
+    assert sorted(events) == [
+        ("visible", "child"),
+        ("visible", "grandchild"),
+        ("visible", "root"),
+    ]
+    events.clear()
+    arrays[2].name = "renamed"
+    grandchild.arrays.append(Array(name="unloaded"))
+    assert events == []
+
+
+def test_group_visible_event_on_load_and_unload():
+    root = Group(name="root")
+    a1 = Array(name="a1", layer=_make_layer("a1"))
+    a2 = Array(name="a2")
+    root.arrays.extend([a1, a2])
+    visible_values = []
+    root.events.visible.connect(lambda event: visible_values.append(event.value))
+    assert root.visible is True
+    a2.layer = _make_layer("a2", visible=False)
+    assert root.visible is None
+    a2.layer = None
+    assert root.visible is True
+    assert visible_values == [None, True]
+
+
+def test_show_emits_one_event_per_group():
+    root = Group(name="root")
+    g1 = Group(name="g1")
+    g2 = Group(name="g2")
+    root.children.append(g1)
+    g1.children.append(g2)
+    g2.arrays.extend(
+        Array(name=f"a{i}", layer=_make_layer(f"a{i}", visible=False))
+        for i in range(10)
+    )
+    visible_values = {group.name: [] for group in (root, g1, g2)}
+    for group in (root, g1, g2):
+        group.events.visible.connect(
+            lambda event: visible_values[event.source.name].append(event.value)
+        )
+    g1.show()
+    assert visible_values == {"root": [True], "g1": [True], "g2": [True]}
+    root.hide()
+    assert visible_values == {
+        "root": [True, False],
+        "g1": [True, False],
+        "g2": [True, False],
+    }
+
+
+def test_layer_events_follow_layer_assignment():
+    old_layer = _make_layer("old")
+    new_layer = _make_layer("new")
+    array = Array(name="array", layer=old_layer)
+    old_layer.name = "old renamed"
+    assert array.name == "old renamed"
+    array.layer = new_layer
+    assert array.name == "new"
+    old_layer.name = "ignored"
+    assert array.name == "new"
+    new_layer.name = "new renamed"
+    assert array.name == "new renamed"
+    array.layer = None
+    new_layer.name = "ignored"
+    assert array.name == "new renamed"
+
+
+def test_name_lookup_in_inserted_event():
+    group = Group(name="group")
+    found = []
+    group.arrays.events.inserted.connect(
+        lambda event: found.append(("b" in group.arrays, group.arrays["b"]))
+    )
+    array = Array(name="b")
+    group.arrays.append(array)
+    assert found == [(True, array)]
+
+
+def test_name_lookup_in_changed_event():
+    group = Group(name="group")
+    group.arrays.append(Array(name="a"))
+    found = []
+    group.arrays.events.changed.connect(
+        lambda event: found.append(("a" in group.arrays, group.arrays["b"]))
+    )
+    array = Array(name="b")
+    group.arrays[0] = array
+    assert found == [(False, array)]
+
+
+def test_name_lookup_after_rename_and_with_duplicates():
+    group = Group(name="group")
+    first = Array(name="x")
+    second = Array(name="y")
+    duplicate = Array(name="x")
+    group.arrays.extend([first, second, duplicate])
+    assert group.arrays["x"] is first
+    assert "z" not in group.arrays
+    with pytest.raises(KeyError):
+        group.arrays["z"]
+    first.name = "z"
+    assert group.arrays["z"] is first
+    assert group.arrays["x"] is duplicate
+    group.arrays.remove(first)
+    assert "z" not in group.arrays
+    first.name = "y"
+    assert group.arrays["y"] is second
+    duplicate.name = "y"
+    assert group.arrays["y"] is second
+    assert "x" not in group.arrays
@@ -0,0 +1,150 @@
+from http.client import IncompleteRead
+from urllib.error import HTTPError
+
+import json
+
+import pytest
+
+from napari_hierarchical.sample_data import pollen
+
+DATA = b"0123456789" * 10
+
+
+class _Response:
+    def __init__(self, data, status=200, headers=None, fail_after=None):
+        self._data = data
+        self._pos = 0
+        self._fail_after = fail_after
+        self.status = status
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def read(self, size):
+        if self._fail_after is not None and self._pos >= self._fail_after:
+            raise IncompleteRead(b"")
+        buf = self._data[self._pos : self._pos + size]
+        self._pos += len(buf)
+        return buf
+
+
+def _mock_urlopen(monkeypatch, responses):
+    requests = []
+
+    def urlopen(request, timeout=None):
+        assert timeout == pollen.download_timeout
+        requests.append(request)
+        return responses.pop(0)
+
+    monkeypatch.setattr(pollen, "urlopen", urlopen)
+    monkeypatch.setattr(pollen, "download_chunk_size", 16)
+    return requests
+
+
+def test_download_resumes_truncated_transfer_with_range_request(monkeypatch, tmp_path):
+    headers = {"Content-Length": str(len(DATA))}
+    requests = _mock_urlopen(
+        monkeypatch,
+        [
+            _Response(DATA, headers=headers, fail_after=32),
+            _Response(DATA[32:], status=206),
+        ],
+    )
+    file = tmp_path / "data.h5"
+    pollen._download("http://example.com/data.h5", file)
+    assert file.read_bytes() == DATA
+    assert requests[1].get_header("Range") == "bytes=32-"
+
+
+def test_download_restarts_truncated_transfer_without_content_length(
+    monkeypatch, tmp_path
+):
+    requests = _mock_urlopen(
+        monkeypatch, [_Response(DATA, fail_after=32), _Response(DATA)]
+    )
+    file = tmp_path / "data.h5"
+    pollen._download("http://example.com/data.h5", file)
+    assert file.read_bytes() == DATA
+    assert requests[1].get_header("Range") is None
+
+
+def test_download_never_keeps_truncated_transfer(monkeypatch, tmp_path):
+    _mock_urlopen(
+        monkeypatch,
+        [
+            _Response(DATA, fail_after=32)
+            for _ in range(pollen.download_max_retries + 1)
+        ],
+    )
+    file = tmp_path / "data.h5"
+    with pytest.raises(IncompleteRead):
+        pollen._download("http://example.com/data.h5", file)
+    assert not file.exists()
+    assert not file.with_name(f"{file.name}.meta").exists()
+
+
+def test_download_stores_validators(monkeypatch, tmp_path):
+    headers = {"ETag": '"v1"', "Last-Modified": "Sat, 01 Jan 2000 00:00:00 GMT"}
+    _mock_urlopen(monkeypatch, [_Response(DATA, headers=headers)])
+    file = tmp_path / "data.h5"
+    pollen._download("http://example.com/data.h5", file)
+    assert file.read_bytes() == DATA
+    meta = json.loads(file.with_name(f"{file.name}.meta").read_text())
+    assert meta == {"etag": '"v1"', "last_modified": "Sat, 01 Jan 2000 00:00:00 GMT"}
+
+
+@pytest.mark.parametrize("meta", [None, '{"etag": null}', '{"etag": "v1', "[]"])
+def test_download_skips_request_without_validators(monkeypatch, tmp_path, meta):
+    requests = _mock_urlopen(monkeypatch, [])
+    file = tmp_path / "data.h5"
+    file.write_bytes(DATA)
+    if meta is not None:
+        file.with_name(f"{file.name}.meta").write_text(meta)
+    pollen._download("http://example.com/data.h5", file)
+    assert file.read_bytes() == DATA
+    assert requests == []
+
+
+@pytest.mark.parametrize("code", [304, 403, 404, 503])
+def test_download_keeps_cached_file_on_http_error(monkeypatch, tmp_path, code):
+    requests = []
+
+    def urlopen(request, timeout=None):
+        requests.append(request)
+        raise HTTPError(request.full_url, code, "error", {}, None)
+
+    monkeypatch.setattr(pollen, "urlopen", urlopen)
+    file = tmp_path / "data.h5"
+    file.write_bytes(DATA)
+    file.with_name(f"{file.name}.meta").write_text(json.dumps({"etag": '"v1"'}))
+    pollen._download("http://example.com/data.h5", file)
+    assert file.read_bytes() == DATA
+    assert requests[0].get_header("If-none-match") == '"v1"'
+
+
+def test_download_raises_http_error_without_cached_file(monkeypatch, tmp_path):
+    def urlopen(request, timeout=None):
+        raise HTTPError(request.full_url, 503, "error", {}, None)
+
+    monkeypatch.setattr(pollen, "urlopen", urlopen)
+    with pytest.raises(HTTPError):
+        pollen._download("http://example.com/data.h5", tmp_path / "data.h5")
+
+
+def test_download_keeps_cached_file_when_transfer_keeps_failing(monkeypatch, tmp_path):
+    _mock_urlopen(
+        monkeypatch,
+        [
+            _Response(DATA[::-1], fail_after=32)
+            for _ in range(pollen.download_max_retries + 1)
+        ],
+    )
+    file = tmp_path / "data.h5"
+    file.write_bytes(DATA)
+    file.with_name(f"{file.name}.meta").write_text(json.dumps({"etag": '"v1"'}))
+    pollen._download("http://example.com/data.h5", file)
+    assert file.read_bytes() == DATA
@@ -1,4 +1,17 @@
-from typing import Any, Generator, Optional
+from collections import deque
+from contextlib import contextmanager
+from typing import (
+    Any,
+    ClassVar,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from napari.layers import Layer
 from napari.utils.events import Event
@@ -11,43 +24,158 @@ from .utils.parent_aware import (
     ParentAwareEventedModel,
 )
 
+_NT = TypeVar("_NT", "Group", "Array")
+
+
+class _NameIndexedList(NestedParentAwareEventedModelList["Group", _NT]):
+    # keeps items indexed by name for O(1) lookups; independent of list events,
+    # which may be blocked (e.g. in Group.from_group)
+    def __init__(self, *args, **kwargs) -> None:
+        self._by_name: Dict[str, List[_NT]] = {}
+        self._item_names: Dict[_NT, str] = {}
+        super().__init__(*args, **kwargs)
+
+    def insert(self, index: int, value: _NT) -> None:
+        # index before inserting, so that inserted event listeners can look it up
+        self._type_check(value)
+        self._add_to_index(value, value.name)
+        try:
+            super().insert(index, value)
+        except Exception:
+            self._remove_from_index(value, value.name)
+            raise
+        value.events.name.connect(self._on_item_name_event)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            items = self._by_name.get(key)
+            if not items:
+                raise KeyError(key)
+            if len(items) == 1:
+                return items[0]
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value) -> None:
+        old_value = self[key] if isinstance(key, int) else None
+        if old_value is None or old_value is value:
+            super().__setitem__(key, value)  # slices are handled by del/insert
+            return
+        self._type_check(value)
+        self._remove_from_index(old_value, self._item_names[old_value])
+        self._add_to_index(value, value.name)
+        try:
+            super().__setitem__(key, value)
+        except Exception:
+            self._remove_from_index(value, value.name)
+            self._add_to_index(old_value, old_value.name)
+            raise
+        old_value.events.name.disconnect(self._on_item_name_event)
+        value.events.name.connect(self._on_item_name_event)
+
+    def __contains__(self, key) -> bool:
+        if isinstance(key, str):
+            return bool(self._by_name.get(key))
+        return super().__contains__(key)
+
+    def _process_delete_item(self, item: _NT) -> None:
+        super()._process_delete_item(item)
+        self._remove_item(item)
+
+    def _remove_item(self, item: _NT) -> None:
+        item.events.name.disconnect(self._on_item_name_event)
+        self._remove_from_index(item, self._item_names[item])
+
+    def _add_to_index(self, item: _NT, name: str) -> None:
+        self._by_name.setdefault(name, []).append(item)
+        self._item_names[item] = name
+
+    def _remove_from_index(self, item: _NT, name: str) -> None:
+        items = self._by_name[name]
+        items.remove(item)
+        if not items:
+            del self._by_name[name]
+        del self._item_names[item]
+
+    def _on_item_name_event(self, event: Event) -> None:
+        item = event.source
+        self._remove_from_index(item, self._item_names[item])
+        self._add_to_index(item, item.name)
+
 
 # do not inherit from napari.utils.tree to avoid conflicts with pydantic-based models
 class Group(NestedParentAwareEventedModel["Group"]):
-    class ArrayList(NestedParentAwareEventedModelList["Group", "Array"]):
+    class ArrayList(_NameIndexedList["Array"]):
         def __init__(self) -> None:
             super().__init__(basetype=Array, lookup={str: lambda array: array.name})
 
-    class GroupList(NestedParentAwareEventedModelList["Group", "Group"]):
+    class GroupList(_NameIndexedList["Group"]):
         def __init__(self) -> None:
             super().__init__(basetype=Group, lookup={str: lambda group: group.name})
 
     name: str
     arrays: ArrayList = Field(default_factory=ArrayList, allow_mutation=False)
     children: GroupList = Field(default_factory=GroupList, allow_mutation=False)
+    # subtree aggregates, updated incrementally (see _update_counts)
+    _n_arrays: int = 0
+    _n_loaded: int = 0
+    _n_visible: int = 0
+    # loaded/visible events are held back while batching (see _batched)
+    _batching: int = 0
+    _pending_loaded_event: Optional[Event] = None
+    _pending_visible_event: Optional[Event] = None
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self.arrays.set_parent(self)
         self.children.set_parent(self)
         self.events.add(loaded=Event, visible=Event)
+        self.arrays.events.inserted.connect(self._on_arrays_inserted_event)
+        self.arrays.events.removed.connect(self._on_arrays_removed_event)
+        self.arrays.events.changed.connect(self._on_arrays_changed_event)
+        self.children.events.inserted.connect(self._on_children_inserted_event)
+        self.children.events.removed.connect(self._on_children_removed_event)
+        self.children.events.changed.connect(self._on_children_changed_event)
 
     @staticmethod
     def from_group(group: "Group") -> "Group":
         new_group = Group(name=group.name)
-        new_group.arrays.extend(Array.from_array(array) for array in group.arrays)
-        new_group.children.extend(Group.from_group(child) for child in group.children)
+        new_groups: List[Group] = []
+        queue: Deque[Tuple[Group, Group]] = deque([(group, new_group)])
+        while queue:
+            old, new = queue.popleft()
+            new_arrays = [Array.from_array(array) for array in old.arrays]
+            new_children = [Group(name=child.name) for child in old.children]
+            # nothing is connected to the new groups yet, so skip per-item events
+            with new.arrays.events.blocker_all():
+                new.arrays.extend(new_arrays)
+            with new.children.events.blocker_all():
+                new.children.extend(new_children)
+            queue.extend(zip(old.children, new_children))
+            new_groups.append(new)
+        # counters are not updated while list events are blocked, recompute bottom-up
+        for new in reversed(new_groups):
+            new._reset_counts()
         return new_group
 
     def show(self) -> None:
-        for array in self.iter_arrays(recursive=True):
-            if array.loaded and not array.visible:
-                array.show()
+        layers = [
+            array.layer
+            for array in self.iter_arrays(recursive=True)
+            if array.layer is not None and not array.layer.visible
+        ]
+        with self._batched():
+            for layer in layers:
+                layer.visible = True
 
     def hide(self) -> None:
-        for array in self.iter_arrays(recursive=True):
-            if array.loaded and array.visible:
-                array.hide()
+        layers = [
+            array.layer
+            for array in self.iter_arrays(recursive=True)
+            if array.layer is not None and array.layer.visible
+        ]
+        with self._batched():
+            for layer in layers:
+                layer.visible = False
 
     def commit(self) -> None:
         self.arrays.commit()
@@ -56,16 +184,26 @@ class Group(NestedParentAwareEventedModel["Group"]):
             child.commit()
 
     def iter_arrays(self, recursive: bool = False) -> Generator["Array", None, None]:
-        yield from self.arrays
-        if recursive:
-            for child in self.children:
-                yield from child.iter_arrays(recursive=recursive)
+        if not recursive:
+            yield from self.arrays
+            return
+        # explicit stack instead of nested generators (reversed to preserve order)
+        stack = [self]
+        while stack:
+            group = stack.pop()
+            yield from group.arrays
+            stack.extend(reversed(group.children))
 
     def iter_children(self, recursive: bool = False) -> Generator["Group", None, None]:
-        yield from self.children
-        if recursive:
-            for child in self.children:
-                yield from child.iter_children(recursive=recursive)
+        if not recursive:
+            yield from self.children
+            return
+        # explicit stack instead of nested generators (reversed to preserve order)
+        stack = [self]
+        while stack:
+            group = stack.pop()
+            yield from group.children
+            stack.extend(reversed(group.children))
 
     def __hash__(self) -> int:
         return object.__hash__(self)
@@ -79,35 +217,155 @@ class Group(NestedParentAwareEventedModel["Group"]):
     def __str__(self) -> str:
         return repr(self)
 
-    def _emit_loaded_event(self, source_array_event: Event) -> None:
-        self.events.loaded(value=self.loaded, source_array_event=source_array_event)
-        if self.parent is not None:
-            self.parent._emit_loaded_event(source_array_event)
+    def __repr_args__(self) -> List[Tuple[Optional[str], Any]]:
+        # used by pydantic's other repr helpers; do not include (nested) fields
+        return [("name", self.name)]
+
+    @contextmanager
+    def _batched(self) -> Generator[None, None, None]:
+        # hold back loaded/visible events of this subtree and its ancestors,
+        # then emit at most one event per group and event type
+        groups = list(self.iter_children(recursive=True))
+        groups.reverse()  # descendants before their ancestors
+        group: Optional[Group] = self
+        while group is not None:
+            groups.append(group)
+            group = group.parent
+        for group in groups:
+            group._batching += 1
+        try:
+            yield
+        finally:
+            for group in groups:
+                group._batching -= 1
+            for group in groups:
+                if group._batching == 0:
+                    group._emit_pending_events()
+
+    def _emit_pending_events(self) -> None:
+        loaded_event = self._pending_loaded_event
+        visible_event = self._pending_visible_event
+        self._pending_loaded_event = None
+        self._pending_visible_event = None
+        if loaded_event is not None:
+            self.events.loaded(value=self.loaded, source_array_event=loaded_event)
+        if visible_event is not None:
+            self.events.visible(value=self.visible, source_array_event=visible_event)
+
+    def _propagate_delta(
+        self, d_loaded: int, d_visible: int, source_array_event: Event
+    ) -> None:
+        self._update_counts(0, d_loaded, d_visible)
+        self._emit_state_events(
+            source_array_event if d_loaded != 0 else None,
+            # visible compares visible against loaded counts, so both deltas matter
+            source_array_event if d_loaded != 0 or d_visible != 0 else None,
+        )
+
+    def _emit_state_events(
+        self, loaded_event: Optional[Event], visible_event: Optional[Event]
+    ) -> None:
+        group: Optional[Group] = self
+        while group is not None:
+            if group._batching > 0:
+                if loaded_event is not None:
+                    group._pending_loaded_event = loaded_event
+                if visible_event is not None:
+                    group._pending_visible_event = visible_event
+            else:
+                if loaded_event is not None:
+                    group.events.loaded(
+                        value=group.loaded, source_array_event=loaded_event
+                    )
+                if visible_event is not None:
+                    group.events.visible(
+                        value=group.visible, source_array_event=visible_event
+                    )
+            group = group.parent
+
+    def _update_counts(self, d_arrays: int, d_loaded: int, d_visible: int) -> None:
+        group: Optional[Group] = self
+        while group is not None:
+            group._n_arrays += d_arrays
+            group._n_loaded += d_loaded
+            group._n_visible += d_visible
+            group = group.parent
+
+    def _reset_counts(self) -> None:
+        self._n_arrays, self._n_loaded, self._n_visible = self._count(self.arrays)
+        for child in self.children:
+            self._n_arrays += child._n_arrays
+            self._n_loaded += child._n_loaded
+            self._n_visible += child._n_visible
 
-    def _emit_visible_event(self, source_array_event: Event) -> None:
-        self.events.visible(value=self.visible, source_array_event=source_array_event)
-        if self.parent is not None:
-            self.parent._emit_visible_event(source_array_event)
+    @staticmethod
+    def _count(arrays: Iterable["Array"]) -> Tuple[int, int, int]:
+        n_arrays = n_loaded = n_visible = 0
+        for array in arrays:
+            n_arrays += 1
+            if array.loaded:
+                n_loaded += 1
+                if array.visible:
+                    n_visible += 1
+        return n_arrays, n_loaded, n_visible
+
+    def _on_arrays_inserted_event(self, event: Event) -> None:
+        array = event.value
+        assert isinstance(array, Array)
+        self._update_counts(1, int(array.loaded), int(array.visible))
+
+    def _on_arrays_removed_event(self, event: Event) -> None:
+        array = event.value
+        assert isinstance(array, Array)
+        self._update_counts(-1, -int(array.loaded), -int(array.visible))
+
+    def _on_arrays_changed_event(self, event: Event) -> None:
+        if isinstance(event.index, int):
+            old_array = event.old_value
+            assert isinstance(old_array, Array)
+            array = event.value
+            assert isinstance(array, Array)
+            self._update_counts(
+                0,
+                int(array.loaded) - int(old_array.loaded),
+                int(array.visible) - int(old_array.visible),
+            )
+
+    def _on_children_inserted_event(self, event: Event) -> None:
+        child = event.value
+        assert isinstance(child, Group)
+        self._update_counts(child._n_arrays, child._n_loaded, child._n_visible)
+
+    def _on_children_removed_event(self, event: Event) -> None:
+        child = event.value
+        assert isinstance(child, Group)
+        self._update_counts(-child._n_arrays, -child._n_loaded, -child._n_visible)
+
+    def _on_children_changed_event(self, event: Event) -> None:
+        if isinstance(event.index, int):
+            old_child = event.old_value
+            assert isinstance(old_child, Group)
+            child = event.value
+            assert isinstance(child, Group)
+            self._update_counts(
+                child._n_arrays - old_child._n_arrays,
+                child._n_loaded - old_child._n_loaded,
+                child._n_visible - old_child._n_visible,
+            )
 
     @property
     def loaded(self) -> Optional[bool]:
-        # evaluate any before all to catch empty iterables!
-        if not any(array.loaded for array in self.iter_arrays(recursive=True)):
+        if self._n_loaded == 0:
             return False
-        if all(array.loaded for array in self.iter_arrays(recursive=True)):
+        if self._n_loaded == self._n_arrays:
             return True
         return None
 
     @property
     def visible(self) -> Optional[bool]:
-        # evaluate any before all to catch empty iterables!
-        if not any(
-            array.visible for array in self.iter_arrays(recursive=True) if array.loaded
-        ):
+        if self._n_visible == 0:
             return False
-        if all(
-            array.visible for array in self.iter_arrays(recursive=True) if array.loaded
-        ):
+        if self._n_visible == self._n_loaded:
             return True
         return None
 
@@ -131,33 +389,45 @@ class Array(ParentAwareEventedModel[Group]):
     flat_grouping_groups: FlatGroupingGroupsDict = Field(
         default_factory=FlatGroupingGroupsDict, allow_mutation=False
     )
+    # last state reported to the parent group, used to compute count deltas
+    _prev_loaded: bool = False
+    _prev_visible: bool = False
+    # skip pydantic validation when assigning correctly typed names/layers
+    _fast_setattr: ClassVar[bool] = True
+    # (event name, callback name) pairs connected for every array
+    _event_callbacks: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ("name", "_on_name_event"),
+        ("layer", "_on_layer_event"),
+        ("loaded", "_on_state_event"),
+        ("visible", "_on_state_event"),
+    )
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
+        self._prev_loaded = self.loaded
+        self._prev_visible = self.visible
         self.flat_grouping_groups.set_parent(self)
         self.events.add(loaded=Event, visible=Event)
-        self.events.name.connect(self._on_name_event)
-        self.events.layer.connect(self._on_layer_event)
-        self.events.loaded.connect(self._on_loaded_event)
-        self.events.visible.connect(self._on_visible_event)
-        layer = kwargs.get("layer")
-        if layer is not None:
-            layer.events.name.connect(self._on_layer_name_event)
-            layer.events.visible.connect(self._on_layer_visible_event)
+        for event_name, callback_name in self._event_callbacks:
+            # (obj, method name) tuples spare napari resolving bound method names
+            getattr(self.events, event_name).connect((self, callback_name))
+        if self.layer is not None:
+            self._connect_layer_events(self.layer)
 
     @staticmethod
     def from_array(array: "Array") -> "Array":
         new_array = Array(name=array.name, layer=array.layer)
-        new_array.flat_grouping_groups.update(array.flat_grouping_groups)
+        with new_array.flat_grouping_groups.events.blocker_all():
+            new_array.flat_grouping_groups.update(array.flat_grouping_groups)
         return new_array
 
     def show(self) -> None:
-        assert self.layer is not None
-        self.layer.visible = True
+        if self.layer is not None:
+            self.layer.visible = True
 
     def hide(self) -> None:
-        assert self.layer is not None
-        self.layer.visible = False
+        if self.layer is not None:
+            self.layer.visible = False
 
     def __hash__(self) -> int:
         return object.__hash__(self)
@@ -171,17 +441,43 @@ class Array(ParentAwareEventedModel[Group]):
     def __str__(self) -> str:
         return repr(self)
 
+    def __repr_args__(self) -> List[Tuple[Optional[str], Any]]:
+        return [("name", self.name)]
+
     def __setattr__(self, name: str, value: Any) -> None:
+        # skip no-op updates to avoid name/layer event ping-pong
+        if name == "name" and value == self.name:
+            return
+        if name == "layer":
+            if value is self.layer:
+                return
+            if self.layer is not None:
+                self._disconnect_layer_events(self.layer)
+        if self._fast_setattr and (
+            (name == "name" and isinstance(value, str))
+            or (name == "layer" and (value is None or isinstance(value, Layer)))
+        ):
+            self._set_field_fast(name, value)
+        else:
+            super().__setattr__(name, value)
         if name == "layer" and self.layer is not None:
-            self.layer.events.name.disconnect(self._on_layer_name_event)
-            self.layer.events.visible.disconnect(self._on_layer_visible_event)
-        super().__setattr__(name, value)
-        if name == "layer" and self.layer is not None:
-            self.layer.events.name.connect(self._on_layer_name_event)
-            self.layer.events.visible.connect(self._on_layer_visible_event)
+            self._connect_layer_events(self.layer)
+
+    def _connect_layer_events(self, layer: Layer) -> None:
+        layer.events.name.connect((self, "_on_layer_name_event"))
+        layer.events.visible.connect((self, "_on_layer_visible_event"))
+
+    def _disconnect_layer_events(self, layer: Layer) -> None:
+        layer.events.name.disconnect((self, "_on_layer_name_event"))
+        layer.events.visible.disconnect((self, "_on_layer_visible_event"))
+
+    def _set_field_fast(self, name: str, value: Any) -> None:
+        self.__dict__[name] = value
+        self.__fields_set__.add(name)
+        getattr(self.events, name)(value=value)
 
     def _on_name_event(self, event: Event) -> None:
-        if self.layer is not None:
+        if self.layer is not None and self.layer.name != self.name:
             self.layer.name = self.name
 
     def _on_layer_event(self, event: Event) -> None:
@@ -191,20 +487,21 @@ class Array(ParentAwareEventedModel[Group]):
         self._emit_visible_event(event)
 
     def _on_layer_name_event(self, event: Event) -> None:
-        assert self.layer is not None
-        self.name = self.layer.name
+        if self.layer is not None and self.name != self.layer.name:
+            self.name = self.layer.name
 
     def _on_layer_visible_event(self, event: Event) -> None:
-        assert self.layer is not None
-        self._emit_visible_event(event)
-
-    def _on_loaded_event(self, event: Event) -> None:
-        if self.parent is not None:
-            self.parent._emit_loaded_event(event)
-
-    def _on_visible_event(self, event: Event) -> None:
-        if self.parent is not None:
-            self.parent._emit_visible_event(event)
+        if self.layer is not None:
+            self._emit_visible_event(event)
+
+    def _on_state_event(self, event: Event) -> None:
+        loaded, visible = self.loaded, self.visible
+        d_loaded = int(loaded) - int(self._prev_loaded)
+        d_visible = int(visible) - int(self._prev_visible)
+        self._prev_loaded = loaded
+        self._prev_visible = visible
+        if self.parent is not None and (d_loaded != 0 or d_visible != 0):
+            self.parent._propagate_delta(d_loaded, d_visible, event)
 
     def _emit_loaded_event(self, source_event: Event) -> None:
         self.events.loaded(value=self.loaded, source_event=source_event)
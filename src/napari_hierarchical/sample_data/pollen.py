@@ -1,10 +1,16 @@
+import json
+import socket
+from hashlib import sha1
+from http.client import IncompleteRead
 from pathlib import Path
-from shutil import copyfileobj
-from tempfile import TemporaryDirectory
+from typing import Dict, Optional
+from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
-from urllib.request import urlopen
+from urllib.request import Request, urlopen
 
+from napari.utils import progress
 from napari.viewer import current_viewer
+from platformdirs import user_cache_dir
 
 from .._controller import controller
 
@@ -12,21 +18,114 @@ url = (
     "https://lmb.informatik.uni-freiburg.de"
     "/resources/opensource/imagej_plugins/samples/pollen.h5"
 )
-temp_dir = TemporaryDirectory()
+cache_dir = (
+    Path(user_cache_dir("napari-hierarchical"))
+    / "sample_data"
+    / sha1(url.encode()).hexdigest()[:16]
+)
+hdf5_file_name = Path(urlparse(url).path).name
+download_chunk_size = 1024 * 1024
+download_max_retries = 3
+download_timeout = 30  # seconds, per blocking socket operation
 
 
 def make_sample_data():
-    hdf5_file_name = Path(urlparse(url).path).name
-    hdf5_file = Path(temp_dir.name) / hdf5_file_name
-    if not hdf5_file.exists():
-        with hdf5_file.open("wb") as fdst:
-            with urlopen(url) as fsrc:
-                copyfileobj(fsrc, fdst)
+    hdf5_file = cache_dir / hdf5_file_name
+    _download(url, hdf5_file)
     controller.read_group(hdf5_file)
     viewer = controller.viewer or current_viewer()
-    assert viewer is not None
+    if viewer is None:
+        raise RuntimeError("No napari viewer available to show the pollen sample")
     if controller.viewer != viewer:
         controller.register_viewer(viewer)
     viewer.window.add_plugin_dock_widget("napari-hierarchical", widget_name="Groups")
     viewer.window.add_plugin_dock_widget("napari-hierarchical", widget_name="Arrays")
     return []
+
+
+def _download(url: str, file: Path) -> None:
+    # download to a separate file, so that partial downloads are never picked up
+    part_file = file.with_name(f"{file.name}.part")
+    # validators of the cached file, to skip the transfer if it is up to date
+    meta_file = file.with_name(f"{file.name}.meta")
+    headers = {}
+    if file.exists():
+        meta = _read_meta(meta_file)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        if not headers:  # nothing to revalidate, use the cached file as is
+            return
+    file.parent.mkdir(parents=True, exist_ok=True)
+    if part_file.exists():
+        part_file.unlink()
+    total = None
+    meta = {}
+    complete = False
+    with progress(desc=f"Downloading {file.name}") as pbar:
+        for attempt in range(download_max_retries + 1):
+            offset = 0
+            if part_file.exists() and total is not None:
+                offset = part_file.stat().st_size
+            if offset > 0:  # without a known size, restart instead of resuming
+                headers = {"Range": f"bytes={offset}-"}
+            try:
+                with urlopen(
+                    Request(url, headers=headers), timeout=download_timeout
+                ) as fsrc:
+                    if fsrc.status != 206:  # full content, e.g. if ranges unsupported
+                        offset = 0
+                        content_length = fsrc.headers.get("Content-Length")
+                        total = int(content_length) if content_length else None
+                        meta = {
+                            "etag": fsrc.headers.get("ETag"),
+                            "last_modified": fsrc.headers.get("Last-Modified"),
+                        }
+                    pbar.total = total
+                    pbar.n = offset
+                    pbar.refresh()
+                    with part_file.open("ab" if offset > 0 else "wb") as fdst:
+                        while True:
+                            buf = fsrc.read(download_chunk_size)
+                            if not buf:
+                                break
+                            fdst.write(buf)
+                            pbar.update(len(buf))
+            except HTTPError as e:
+                if e.code == 304:  # not modified
+                    return
+                if file.exists():  # server error, use the cached file
+                    return
+                raise
+            except URLError:
+                if file.exists():  # offline, use the cached file
+                    return
+                raise
+            except (IncompleteRead, ConnectionError, socket.timeout):
+                if attempt < download_max_retries:
+                    continue
+                if file.exists():  # transfer keeps failing, use the cached file
+                    return
+                raise
+            if total is None or part_file.stat().st_size == total:
+                complete = True
+                break
+    if not complete:
+        raise OSError(
+            f"Incomplete download ({part_file.stat().st_size}/{total}): {url}"
+        )
+    part_file.replace(file)
+    # write the sidecar atomically, a truncated one would be read as missing
+    meta_part_file = meta_file.with_name(f"{meta_file.name}.part")
+    meta_part_file.write_text(json.dumps(meta))
+    meta_part_file.replace(meta_file)
+
+
+def _read_meta(meta_file: Path) -> Dict[str, Optional[str]]:
+    # a missing or unreadable sidecar is treated as holding no validators
+    try:
+        meta = json.loads(meta_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}